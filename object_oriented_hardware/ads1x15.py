@@ -19,9 +19,15 @@
 # LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
+import logging
+import os
+import select
+import threading
 import time
 from object_oriented_hardware.hardware_interfaces import VoltageInputInterface
 
+log = logging.getLogger(__name__)
+
 
 # Register and other configuration values:
 ADS1x15_DEFAULT_ADDRESS        = 0x48
@@ -72,6 +78,25 @@ ADS1x15_CONFIG_COMP_QUE = {
     4: 0x0002
 }
 ADS1x15_CONFIG_COMP_QUE_DISABLE = 0x0003
+# Threshold values that put the ALERT/RDY pin in conversion-ready mode (datasheet section 9.3.8):
+# high threshold MSB set, low threshold MSB clear.
+ADS1x15_CONVERSION_READY_HIGH_THRESHOLD = 0x8000
+ADS1x15_CONVERSION_READY_LOW_THRESHOLD  = 0x0000
+
+
+def _configure_gpio_edge(gpio, edge):
+    """
+    Exports a sysfs GPIO as an edge-triggered input and returns the path of its value file.
+    """
+    gpio_path = '/sys/class/gpio/gpio{}'.format(gpio)
+    if not os.path.exists(gpio_path):
+        with open('/sys/class/gpio/export', 'w') as export_file:
+            export_file.write(str(gpio))
+    with open(os.path.join(gpio_path, 'direction'), 'w') as direction_file:
+        direction_file.write('in')
+    with open(os.path.join(gpio_path, 'edge'), 'w') as edge_file:
+        edge_file.write(edge)
+    return os.path.join(gpio_path, 'value')
 
 
 class ADS1x15(object):
@@ -363,6 +388,7 @@ class ADS1015(ADS1x15):
 
 
 class ADS1015VoltageInputInterface(VoltageInputInterface):
+    __slots__ = ('ads1015', 'gain', 'channel_index', '_bound_read_code', '_continuous_stop', '_continuous_thread')
 
     # Gain to Volts-per-bit conversion from From datasheet Table 1
     volts_per_bit= \
@@ -380,9 +406,132 @@ class ADS1015VoltageInputInterface(VoltageInputInterface):
         self.ads1015 = ads1x15
         self.gain = gain
         self.channel_index = channel_index
+        self._continuous_stop = None
+        self._continuous_thread = None
         self.ads1015.start_adc(channel_index, gain)
 
+    @property
+    def counts_per_volt(self):
+        """
+        returns the number of ADC counts per volt at the configured gain.
+        """
+        return 1.0/self.__class__.volts_per_bit[self.gain]
+
+    def _bind(self):
+        super()._bind()
+        self._bound_read_code = self._simulated_read_code if self._simulated else self._read_code
+
+    def read_code(self):
+        """
+        returns the raw signed ADC code of the most recent conversion.
+        When simulated, returns simulated_input expressed in ADC counts (not rounded).
+        """
+        return self._bound_read_code()
+
+    def _read_code(self):
+        return self.ads1015.get_last_result()
+
+    def _simulated_read_code(self):
+        return self.simulated_input * self.counts_per_volt
+
     def _read(self):
         raw_bits = self.ads1015.get_last_result()
         return raw_bits * self.__class__.volts_per_bit[self.gain]
 
+    @classmethod
+    def read_many(cls, inputs):
+        """
+        returns a list of voltages, one per input.
+        Conversion registers of all inputs sharing an I2C bus are read back in a single transaction.
+        """
+        voltages = [None] * len(inputs)
+        indices_by_bus = {}
+        for index, voltage_input in enumerate(inputs):
+            if voltage_input.simulated:
+                voltages[index] = voltage_input.simulated_input
+            else:
+                indices_by_bus.setdefault(voltage_input.ads1015.i2c, []).append(index)
+        for i2c, indices in indices_by_bus.items():
+            results = i2c.read_list_many([(inputs[i].ads1015.address, ADS1x15_POINTER_CONVERSION, 2)
+                                          for i in indices])
+            for index, result in zip(indices, results):
+                voltage_input = inputs[index]
+                raw_bits = voltage_input.ads1015._conversion_value(result[1], result[0])
+                voltages[index] = raw_bits * cls.volts_per_bit[voltage_input.gain]
+        return voltages
+
+    def start_continuous(self, callback, gpio, data_rate=None):
+        """
+        Starts continuous conversions with the ADS1x15 ALERT/RDY pin signalling each new sample,
+        and calls callback from a background thread as soon as each conversion is ready.
+        Call stop_continuous() to stop.
+
+        :param callback: called with the new voltage (in volts) after every conversion
+        :param gpio: sysfs GPIO number wired to the ADS1x15 ALERT/RDY pin
+        :param data_rate: conversion rate in samples per second. Defaults to the ADC's default rate.
+        """
+        if self._simulated:
+            raise RuntimeError('Continuous mode needs the ALERT/RDY pin and is not available when simulated.')
+        self.stop_continuous()
+        # Set up the GPIO before reconfiguring the ADC so a GPIO failure leaves the ADC untouched.
+        value_path = _configure_gpio_edge(gpio, 'falling')
+        # ALERT/RDY is active low, so it pulls low for a few microseconds at the end of every conversion.
+        self.ads1015.start_adc_comparator(self.channel_index,
+                                          ADS1x15_CONVERSION_READY_HIGH_THRESHOLD,
+                                          ADS1x15_CONVERSION_READY_LOW_THRESHOLD,
+                                          gain=self.gain, data_rate=data_rate)
+        self._continuous_stop = threading.Event()
+        self._continuous_thread = threading.Thread(target=self._run_continuous,
+                                                   args=(callback, value_path, self._continuous_stop),
+                                                   daemon=True)
+        self._continuous_thread.start()
+
+    def stop_continuous(self):
+        """
+        Stops the callback thread started by start_continuous and returns the ADC to plain
+        continuous conversions on this channel. May be called from within the callback.
+        """
+        thread, stop = self._continuous_thread, self._continuous_stop
+        if thread is None:
+            return
+        stop.set()
+        # From inside the callback the worker exits on its own once the callback returns.
+        if thread is not threading.current_thread():
+            thread.join()
+        self._continuous_stop = None
+        self._continuous_thread = None
+        self.ads1015.start_adc(self.channel_index, self.gain)
+
+    def _run_continuous(self, callback, value_path, stop):
+        """
+        Waits for ALERT/RDY edges and hands each new conversion to the callback until stop is set.
+        """
+        volts_per_bit = self.__class__.volts_per_bit[self.gain]
+        try:
+            with open(value_path, 'rb', buffering=0) as value_file:
+                poller = select.epoll()
+                try:
+                    poller.register(value_file, select.EPOLLPRI | select.EPOLLERR)
+                    # Clear any edge that fired before we started waiting.
+                    value_file.read()
+                    while not stop.is_set():
+                        # Wake up periodically so stop_continuous() doesn't wait on a stalled ADC.
+                        if not poller.poll(0.1):
+                            continue
+                        value_file.seek(0)
+                        value_file.read()
+                        callback(self.ads1015.get_last_result() * volts_per_bit)
+                finally:
+                    poller.close()
+        except Exception:
+            log.exception('Continuous conversion on channel %d stopped after an error.', self.channel_index)
+        finally:
+            # If we died on our own, undo what stop_continuous() would have: clear the state so
+            # start_continuous() can run again and return the ADC to plain continuous conversions.
+            if not stop.is_set() and self._continuous_stop is stop:
+                self._continuous_stop = None
+                self._continuous_thread = None
+                try:
+                    self.ads1015.start_adc(self.channel_index, self.gain)
+                except OSError:
+                    log.exception('Could not restore continuous conversions on channel %d.', self.channel_index)
@@ -1,179 +1,279 @@
 #!/usr/bin/python
 """
-Provides BBI2CBus0, BBI2CBus1, and BBI2CBus2 as singleton objects for reading a specific Beaglebone I2C bus.
+Provides BBI2CBus, with one shared instance per Beaglebone I2C bus available via bbi2c_bus(bus_num).
 """
 
-import abc
+import collections
+import contextlib
+import ctypes
 import logging
 import threading
-from .singleton import Singleton
+import time
 
 
 def retry_on_fail(func):
     """
-    a decorator that retries an exception-throwing BBI2C transaction up to 3 times before giving up.
+    a decorator that retries an exception-throwing BBI2C transaction up to BBI2CBus.RETRIES times
+    in total before giving up.
     """
     def retry_on_fail_internal(self, *args, **kwargs):
-        num_tries = 0
-        while num_tries <= 3:
+        retries = BBI2CBus.RETRIES
+        if retries < 1:
+            raise ValueError("BBI2CBus.RETRIES must be at least 1, got {}.".format(retries))
+        for attempt in range(retries):
             try:
-                with self._get_lock():
-                    return func(self, *args, **kwargs)
-                break
+                return func(self, *args, **kwargs)
             except OSError:
-                num_tries += 1
-                if num_tries < 3:
-                    self.log.warning("Remote IO Error occurred performing an I2C {} on bus {}. Retrying."
-                                     .format(func.__name__, self.bus_num))
-                else:
-                    self.log.warning("Giving up after {} attempts!".format(num_tries))
+                if attempt == retries - 1:
+                    self.log.warning("Remote IO Error occurred performing an I2C %s on bus %d. "
+                                     "Giving up after %d attempts!", func.__name__, self.bus_num, retries)
                     raise
+                self.log.warning("Remote IO Error occurred performing an I2C %s on bus %d. Retrying (%d/%d).",
+                                 func.__name__, self.bus_num, attempt + 1, retries - 1)
+                # Back off briefly (1, 2, 4 ms, ...) to let the bus settle.
+                time.sleep(0.001 * (1 << attempt))
     return retry_on_fail_internal
 
 
-class BBI2CBus(metaclass=abc.ABCMeta):
+def lock_address(func):
+    """
+    a decorator that serializes BBI2C transactions to the same device address.
+    The bus-wide lock is only taken around the raw bus access inside the wrapped method, so
+    transactions to unrelated devices on the same bus don't queue behind each other's retries.
+    """
+    def lock_address_internal(self, address, *args, **kwargs):
+        with self._get_address_lock(address):
+            return func(self, address, *args, **kwargs)
+    return lock_address_internal
+
+
+# Private sentinel that only BBI2CBus.get() passes to the constructor.
+_CONSTRUCT_TOKEN = object()
 
-    DEBUG = False # Set to True for more verbose i2c chatter.
 
-    def __init__(self, bus_num):
-        # smbus is not provided on all systems, so only import it if we try to instantiate an object.
+class BBI2CBus(object):
+
+    USE_LOCK = True # Set to False to skip bus locking in single-threaded configurations.
+    RETRIES = 3 # Total attempts per transaction before an OSError is re-raised. Must be at least 1.
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def get(cls, bus_num):
+        """
+        returns the shared BBI2CBus for the bus number, creating it on first use.
+        """
+        bus = cls._instances.get(bus_num)
+        if bus is None:
+            with cls._instances_lock:
+                bus = cls._instances.get(bus_num)
+                if bus is None:
+                    bus = cls._instances[bus_num] = cls(bus_num, _token=_CONSTRUCT_TOKEN)
+        return bus
+
+    def __init__(self, bus_num, _token=None):
+        # Each bus must have exactly one instance so that its locks actually serialize access.
+        if _token is not _CONSTRUCT_TOKEN:
+            raise TypeError("Use bbi2c_bus(bus_num) or BBI2CBus.get(bus_num) to get a shared I2C bus.")
+        # smbus2 is not provided on all systems, so only import it if we try to instantiate an object.
         self.log = logging.getLogger(__name__)
         try:
-            import smbus
+            import smbus2
         except ImportError:
-            from object_oriented_hardware.stubs import smbus
-            self.log.error("Cannot import smbus; Continuing with a stub.")
+            from object_oriented_hardware.stubs import smbus2
+            self.log.error("Cannot import smbus2; Continuing with a stub.")
         assert 0 <= bus_num <= 2, "Error, valid i2c buses are only {}.".format([i for i in range(3)])
         self.bus_num = bus_num
-        self.bus = smbus.SMBus(bus_num)
+        self.bus = smbus2.SMBus(bus_num)
+        self.i2c_msg = smbus2.i2c_msg
+        # Cache bound bus methods to skip repeated attribute lookups in the I/O hot path.
+        self._write_byte = self.bus.write_byte_data
+        self._write_word = self.bus.write_word_data
+        self._rdwr = self.bus.i2c_rdwr
+        # i2c_msg objects reused across transactions, keyed by (address, reg, length, is_read).
+        self._msg_cache = {}
+        self.bus_lock = threading.Lock()
+        self._addr_locks = collections.defaultdict(threading.Lock)
 
-    @abc.abstractmethod
     def _get_lock(self):
         """
-        returns a lock for this i2c bus
-        Abstract! To be implemented by the Singleton.
+        returns a thread lock for the bus number, or a no-op context if locking is disabled.
         """
-        pass
+        if not BBI2CBus.USE_LOCK:
+            return contextlib.nullcontext()
+        return self.bus_lock
 
+    def _get_address_lock(self, address):
+        """
+        returns a thread lock for the device address, or a no-op context if locking is disabled.
+        """
+        if not BBI2CBus.USE_LOCK:
+            return contextlib.nullcontext()
+        return self._addr_locks[address]
+
+    def _get_read_msgs(self, address, reg, length):
+        """
+        returns a cached (register pointer write, read) i2c_msg pair for the address/register/length.
+        """
+        key = (address, reg, length, True)
+        msgs = self._msg_cache.get(key)
+        if msgs is None:
+            msgs = self._msg_cache[key] = (self.i2c_msg.write(address, [reg]),
+                                           self.i2c_msg.read(address, length))
+        return msgs
+
+    def _get_write_msg(self, address, reg, values):
+        """
+        returns a cached i2c_msg writing values to the register, with values copied into its buffer.
+        """
+        length = len(values)
+        key = (address, reg, length, False)
+        msg = self._msg_cache.get(key)
+        if msg is None:
+            msg = self._msg_cache[key] = self.i2c_msg.write(address, [reg] + [0] * length)
+        # Overwrite the data bytes that follow the register pointer in place.
+        ctypes.memmove(ctypes.addressof(msg.buf.contents) + 1, bytes(values), length)
+        return msg
+
+    def _combined_write_read(self, address, reg, length):
+        """
+        Writes the register pointer and reads length bytes back in a single combined
+        (repeated-START) transaction. Returns a bytes object.
+        """
+        msgs = self._get_read_msgs(address, reg, length)
+        with self._get_lock():
+            self._rdwr(*msgs)
+            return bytes(msgs[1])
+
+    @lock_address
     @retry_on_fail
     def write8(self, address, reg, value):
         "Writes an 8-bit value to the specified register/address. Retry on failures."
-        if BBI2CBus.DEBUG:
-            self.log.debug("I2C: Writing 0x{:02X} to register 0x{:02X} on device 0x{:02X}"
-                            .format(value, reg, address))
-        self.bus.write_byte_data(address, reg, value)
+        if self.log.isEnabledFor(logging.DEBUG):
+            self.log.debug("I2C: Writing 0x%02X to register 0x%02X on device 0x%02X", value, reg, address)
+        with self._get_lock():
+            self._write_byte(address, reg, value)
 
+    @lock_address
     @retry_on_fail
     def write16(self, address, reg, value):
         "Writes a 16-bit value to the specified register/address pair. Retry on failures."
-        if BBI2CBus.DEBUG:
-            self.log.debug("I2C: Writing 0x{:02X} to register 0x{:02X} on device 0x{:02X}"
-                            .format(value, reg, address))
-        self.bus.write_word_data(address, reg, value)
+        if self.log.isEnabledFor(logging.DEBUG):
+            self.log.debug("I2C: Writing 0x%04X to register 0x%02X on device 0x%02X", value, reg, address)
+        with self._get_lock():
+            self._write_word(address, reg, value)
 
+    @lock_address
     @retry_on_fail
     def write_list(self, address, reg, values):
         "Writes an array of bytes using I2C format. Retry on failures."
-        if BBI2CBus.DEBUG:
-            self.log.debug("I2C: Writing {} to register 0x{:02X} on device 0x{:02X}"
-                            .format(["0x{:02X}".format(i) for i in values], reg, address))
-        self.bus.write_i2c_block_data(address, reg, values)
+        if self.log.isEnabledFor(logging.DEBUG):
+            self.log.debug("I2C: Writing [%s] to register 0x%02X on device 0x%02X",
+                           bytes(values).hex(' '), reg, address)
+        with self._get_lock():
+            self._rdwr(self._get_write_msg(address, reg, values))
 
+    @lock_address
+    @retry_on_fail
+    def write_many(self, address, pairs, coalesce=False):
+        """
+        Writes a batch of (reg, value) byte pairs to one device, submitting all writes in one
+        transaction. Retry on failures.
+
+        If coalesce is True, runs of contiguous registers are collapsed into a single burst. Only
+        enable this for devices with byte-wide, auto-incrementing registers. It is NOT valid for
+        the ADS1x15, whose registers are 16 bits wide and addressed through a pointer register.
+        """
+        runs = []
+        for reg, value in pairs:
+            if coalesce and runs and runs[-1][0] + len(runs[-1]) - 1 == reg:
+                runs[-1].append(value)
+            else:
+                runs.append([reg, value])
+        if not runs:
+            # The kernel rejects an i2c_rdwr with no messages (EINVAL), so there is nothing to send.
+            return
+        if self.log.isEnabledFor(logging.DEBUG):
+            self.log.debug("I2C: Writing %s to device 0x%02X",
+                           " ".join("[%s]" % bytes(run).hex(' ') for run in runs), address)
+        with self._get_lock():
+            self._rdwr(*[self.i2c_msg.write(address, run) for run in runs])
+
+    @lock_address
     @retry_on_fail
     def read8(self, address, reg):
         "Read an unsigned byte from the I2C device"
-        value = self.bus.read_byte_data(address, reg)
-        if BBI2CBus.DEBUG:
-            self.log.debug("I2C: Read 0x{:02X} from register 0x{:02X} of device 0x{:02X}"
-                            .format(value, reg, address))
+        value = self._combined_write_read(address, reg, 1)[0]
+        if self.log.isEnabledFor(logging.DEBUG):
+            self.log.debug("I2C: Read 0x%02X from register 0x%02X of device 0x%02X", value, reg, address)
         return value
 
+    @lock_address
     @retry_on_fail
     def read16(self, address, reg):
         "Reads an unsigned 16-bit value from the I2C device"
-        value = self.bus.read_word_data(address, reg)
-        if BBI2CBus.DEBUG:
-            self.log.debug("I2C: Read 0x{:02X} from register 0x{:02X} of device 0x{:02X}"
-                            .format(value, reg, address))
+        low, high = self._combined_write_read(address, reg, 2)
+        value = (high << 8) | low
+        if self.log.isEnabledFor(logging.DEBUG):
+            self.log.debug("I2C: Read 0x%04X from register 0x%02X of device 0x%02X", value, reg, address)
         return value
 
+    @lock_address
     @retry_on_fail
     def read_list(self, address, reg, length):
-        "Read a list of bytes from the I2C device. Retry on failures."
-        values = self.bus.read_i2c_block_data(address, reg, length)
-        if BBI2CBus.DEBUG:
-            self.log.debug("I2C: Read {} from register 0x{:02X} of device 0x{:02X}"
-                            .format(["0x{:02X}".format(i) for i in values], reg, address))
+        "Read a block of bytes from the I2C device, returned as a bytes object. Retry on failures."
+        values = self._combined_write_read(address, reg, length)
+        if self.log.isEnabledFor(logging.DEBUG):
+            self.log.debug("I2C: Read [%s] from register 0x%02X of device 0x%02X",
+                           values.hex(' '), reg, address)
         return values
 
-
-class BBI2CBus0(Singleton, BBI2CBus):
-    """
-    A singleton class for the Beaglebone I2C Bus number 0
-    """
-
-    def init(self):
+    @retry_on_fail
+    def read_list_many(self, requests):
         """
-        Singleton class requires us to write an init instead of an __init__
+        Reads several (address, reg, length) blocks in a single combined transaction.
+        Returns a list of bytes objects in request order. Retry on failures.
         """
-        super().__init__(bus_num=0)
-        self.bus_lock = threading.RLock()
+        msgs = []
+        for address, reg, length in requests:
+            msgs.extend(self._get_read_msgs(address, reg, length))
+        with self._get_lock():
+            self._rdwr(*msgs)
+            values = [bytes(msg) for msg in msgs[1::2]]
+        if self.log.isEnabledFor(logging.DEBUG):
+            for (address, reg, length), block in zip(requests, values):
+                self.log.debug("I2C: Read [%s] from register 0x%02X of device 0x%02X",
+                               block.hex(' '), reg, address)
+        return values
 
-    def __init__(self):
-        # Don't define anything as it will be called by the constructor every time
-        # BBI2CBus0 is instantiated. Rather, use the init function.
-        pass
 
-    def _get_lock(self):
-        """
-        returns a re-entrant thread lock for the bus number.
-        """
-        return self.bus_lock
-
-class BBI2CBus1(Singleton, BBI2CBus):
+def bbi2c_bus(bus_num):
     """
-    A singleton class for the Beaglebone I2C Bus number 1
+    returns the shared BBI2CBus for the Beaglebone I2C bus number, creating it on first use.
     """
+    return BBI2CBus.get(bus_num)
 
-    def init(self):
-        """
-        Singleton class requires us to write an init instead of an __init__
-        """
-        super().__init__(bus_num=1)
-        self.bus_lock = threading.RLock()
 
-    def __init__(self):
-        # Don't define anything as it will be called by the constructor every time
-        # BBI2CBus1 is instantiated. Rather, use the init function.
-        pass
-
-    def _get_lock(self):
-        """
-        returns a re-entrant thread lock for the bus number.
-        """
-        return self.bus_lock
-
-
-class BBI2CBus2(Singleton, BBI2CBus):
+def BBI2CBus0():
     """
-    A singleton class for the Beaglebone I2C Bus number 2
+    returns the shared BBI2CBus for Beaglebone I2C bus 0. Kept for backwards compatibility; use
+    bbi2c_bus(0). This is a factory, not a class, so don't use it in isinstance checks.
     """
+    return BBI2CBus.get(0)
 
-    def init(self):
-        """
-        Singleton class requires us to write an init instead of an __init__
-        """
-        super().__init__(bus_num=2)
-        self.bus_lock = threading.RLock()
 
-    def __init__(self):
-        # Don't define anything as it will be called by the constructor every time
-        # BBI2CBus2 is instantiated. Rather, use the init function.
-        pass
+def BBI2CBus1():
+    """
+    returns the shared BBI2CBus for Beaglebone I2C bus 1. Kept for backwards compatibility; use
+    bbi2c_bus(1). This is a factory, not a class, so don't use it in isinstance checks.
+    """
+    return BBI2CBus.get(1)
 
-    def _get_lock(self):
-        """
-        returns a re-entrant thread lock for the bus number.
-        """
-        return self.bus_lock
 
+def BBI2CBus2():
+    """
+    returns the shared BBI2CBus for Beaglebone I2C bus 2. Kept for backwards compatibility; use
+    bbi2c_bus(2). This is a factory, not a class, so don't use it in isinstance checks.
+    """
+    return BBI2CBus.get(2)
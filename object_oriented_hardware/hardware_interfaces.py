@@ -2,22 +2,80 @@
 
 import abc
 
-class HardwareInterface(object):
-    simulated = False
+class _HardwareInterfaceMeta(abc.ABCMeta):
+    """
+    Rejects class-level assignment to or deletion of simulated. Either would remove the
+    per-instance property, leaving already-bound instances reading the hardware and, since
+    interfaces have no __dict__, with no way to set simulated on them again.
+    """
+
+    def __setattr__(cls, name, value):
+        if name == 'simulated':
+            raise AttributeError("simulated is set per instance (e.g. interface.simulated = True), "
+                                 "not on {}.".format(cls.__name__))
+        super().__setattr__(name, value)
+
+    def __delattr__(cls, name):
+        if name == 'simulated':
+            raise AttributeError("simulated cannot be removed from {}.".format(cls.__name__))
+        super().__delattr__(name)
+
+class HardwareInterface(object, metaclass=_HardwareInterfaceMeta):
+    # All interface slots live here so a class can combine several interfaces (e.g. a pin that is
+    # both a digital input and a digital output) without a slot layout conflict.
+    __slots__ = ('_simulated', 'simulated_input', 'simulated_output', '_bound_read', '_bound_write')
+
+    def __new__(cls, *args, **kwargs):
+        # Set up the mode and fast path here rather than in __init__ so they are in place even
+        # for subclasses that don't call super().__init__().
+        self = super().__new__(cls)
+        self._simulated = False
+        self._bind()
+        return self
+
+    @property
+    def simulated(self):
+        return self._simulated
+
+    @simulated.setter
+    def simulated(self, simulated):
+        self.set_simulated(simulated)
+
+    def set_simulated(self, simulated):
+        """
+        Switches the interface between simulated and real hardware access.
+        The private read/write target is re-bound here so read()/write() don't need to check the
+        mode on every call.
+        """
+        self._simulated = simulated
+        self._bind()
+
+    def _bind(self):
+        """
+        Binds the private read/write target for the current mode. Each interface extends this and
+        calls super()._bind() so that combined interfaces bind all of their targets.
+        """
+        pass
 
 class DigitalInputInterface(HardwareInterface, metaclass=abc.ABCMeta):
+    __slots__ = ()
 
     def __init__(self):
+        super().__init__()
         self.simulated_input = False
 
+    def _bind(self):
+        super()._bind()
+        self._bound_read = self._simulated_read if self._simulated else self._read
+
+    def _simulated_read(self):
+        return self.simulated_input
+
     def read(self):
         """
         returns True or False
         """
-        if self.simulated:
-            return self.simulated_input
-        else:
-            return self._read()
+        return self._bound_read()
 
     @abc.abstractmethod
     def _read(self):
@@ -27,18 +85,32 @@ class DigitalInputInterface(HardwareInterface, metaclass=abc.ABCMeta):
         pass
 
 class AnalogInputInterface(HardwareInterface, metaclass=abc.ABCMeta):
+    __slots__ = ()
 
     def __init__(self):
+        super().__init__()
         self.simulated_input = 0.0
 
+    def _bind(self):
+        super()._bind()
+        self._bound_read = self._simulated_read if self._simulated else self._read
+
+    def _simulated_read(self):
+        return self.simulated_input
+
     def read(self):
         """
         returns the analog value. Units are implementation-specific.
         """
-        if self.simulated:
-            return self.simulated_input
-        else:
-            return self._read()
+        return self._bound_read()
+
+    @classmethod
+    def read_many(cls, inputs):
+        """
+        returns a list of analog values, one per input.
+        Subclasses may override this to batch the underlying hardware reads.
+        """
+        return [analog_input.read() for analog_input in inputs]
 
     @abc.abstractmethod
     def _read(self):
@@ -49,6 +121,7 @@ class AnalogInputInterface(HardwareInterface, metaclass=abc.ABCMeta):
 
 
 class VoltageInputInterface(AnalogInputInterface):
+    __slots__ = ()
 
     @abc.abstractmethod
     def _read(self):
@@ -59,20 +132,26 @@ class VoltageInputInterface(AnalogInputInterface):
 
 
 class DigitalOutputInterface(HardwareInterface, metaclass=abc.ABCMeta):
+    __slots__ = ()
 
     def __init__(self):
+        super().__init__()
         self.simulated_output = False
 
+    def _bind(self):
+        super()._bind()
+        self._bound_write = self._simulated_write if self._simulated else self._write
+
+    def _simulated_write(self, value):
+        self.simulated_output = value
+
     def write(self, value):
         """
         Writes value to the output.
 
         :param value: True or False
         """
-        if self.simulated:
-            self.simulated_output = value
-        else:
-            self._write(value)
+        self._bound_write(value)
 
     @abc.abstractmethod
     def _write(self, value):
@@ -83,20 +162,26 @@ class DigitalOutputInterface(HardwareInterface, metaclass=abc.ABCMeta):
 
 
 class AnalogOutputInterface(HardwareInterface, metaclass=abc.ABCMeta):
+    __slots__ = ()
 
     def __init__(self):
+        super().__init__()
         self.simulated_output = 0.0
 
+    def _bind(self):
+        super()._bind()
+        self._bound_write = self._simulated_write if self._simulated else self._write
+
+    def _simulated_write(self, value):
+        self.simulated_output = value
+
     def write(self, value):
         """
         Writes the analog value to the output. Units are implementation-specific.
 
         :param value: True or False
         """
-        if self.simulated:
-            self.simulated_output = value
-        else:
-            self._write(value)
+        self._bound_write(value)
 
     @abc.abstractmethod
     def _write(self, value):
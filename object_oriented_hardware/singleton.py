@@ -1,15 +0,0 @@
-"""
-Singleton design pattern copied from the official Python docs.
-https://www.python.org/download/releases/2.2/descrintro/#__new__
-"""
-
-class Singleton(object):
-    def __new__(cls, *args, **kwds):
-        it = cls.__dict__.get("__it__")
-        if it is not None:
-            return it
-        cls.__it__ = it = object.__new__(cls)
-        it.init(*args, **kwds)
-        return it
-    def init(self, *args, **kwds):
-        pass
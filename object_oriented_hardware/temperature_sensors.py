@@ -3,12 +3,16 @@
 import abc
 from math import log
 
+_ABS0_C = 273.15 # absolute zero offset in degrees Celsius
+_C_TO_F = 1.8 # Celsius to Fahrenheit scale factor
+
 class TemperatureSensor(metaclass=abc.ABCMeta):
     """
     an abstract temperature sensor class
     """
+    __slots__ = ()
 
-    ABSOLUTE_ZERO_OFFSET_C = 273.15
+    ABSOLUTE_ZERO_OFFSET_C = _ABS0_C
 
     def __init__(self):
         pass
@@ -24,13 +28,13 @@ class TemperatureSensor(metaclass=abc.ABCMeta):
         """
         returns the temperature in degrees Celsius
         """
-        return self.read_temperature_k() - TemperatureSensor.ABSOLUTE_ZERO_OFFSET_C
+        return self.read_temperature_k() - _ABS0_C
 
     def read_temperature_f(self):
         """
         returns the temperature in degrees Fahrenheit
         """
-        return self.read_temperature_c() * (9.0/5.0) + 32.0
+        return self.read_temperature_c() * _C_TO_F + 32.0
 
 
 class Thermistor(TemperatureSensor):
@@ -40,6 +44,8 @@ class Thermistor(TemperatureSensor):
     Note: thermistor is assumed to be read from a resistor divider configuration with
           a supplementary pulldown resistor added. Pullup value must be provided on init.
     """
+    __slots__ = ('b', 'thermistor_ohms', 'r2_ohms', 'vin_v', 'voltage_input',
+                 '_inv_t0', '_inv_b', '_inv_r0', '_sample', '_vin_sample')
 
     def __init__(self, voltage_input_interface, b=3950, thermistor_ohms=10000,
                  r2_ohms=10000, vin_v=5.0):
@@ -57,6 +63,27 @@ class Thermistor(TemperatureSensor):
         self.r2_ohms = r2_ohms
         self.vin_v = vin_v
         self.voltage_input = voltage_input_interface
+        # Precompute reciprocals used by the simplified Steinhart–Hart equation.
+        self._inv_t0 = 1.0/298.15
+        self._inv_b = 1.0/self.b
+        self._inv_r0 = 1.0/self.thermistor_ohms
+        self.rebind()
+
+    def rebind(self):
+        """
+        Refreshes the cached sample method. Call this after replacing voltage_input or changing its gain.
+        The cached read()/read_code() follow the input's simulated mode on every call, so toggling
+        voltage_input.simulated needs no rebind.
+        """
+        # The divider ratio vin/v is unitless, so when the input exposes raw ADC codes sample those
+        # and express vin in counts too, skipping the counts-to-volts multiply on every read.
+        counts_per_volt = getattr(self.voltage_input, 'counts_per_volt', None)
+        if counts_per_volt is not None:
+            self._sample = self.voltage_input.read_code
+            self._vin_sample = self.vin_v * counts_per_volt
+        else:
+            self._sample = self.voltage_input.read
+            self._vin_sample = self.vin_v
 
     def _read_resistance(self, voltage_v):
         """
@@ -64,14 +91,34 @@ class Thermistor(TemperatureSensor):
         """
         return self.r2_ohms * (self.vin_v/voltage_v - 1)
 
+    def _kelvin(self, ratio):
+        """
+        returns the temperature in Kelvin for a divider ratio vin/v, with vin and v in the same units.
+        Evaluates the simplified (B-parameter) Steinhart–Hart equation.
+        """
+        r1_ohms = self.r2_ohms * (ratio - 1)
+        return 1.0/(self._inv_t0 + self._inv_b * log(r1_ohms * self._inv_r0))
+
+    def convert_temperature_c(self, voltage_v):
+        """
+        returns the temperature in degrees Celsius for a divider voltage (in volts) that was
+        measured elsewhere, e.g. passed to a start_continuous callback.
+        """
+        return self._kelvin(self.vin_v/voltage_v) - _ABS0_C
+
     def read_temperature_k(self):
         """
         returns the temperature in Kelvin
         Note: implements abstract base class read_temperature_k
         """
-        voltage_v = self.voltage_input.read()
-        r1_ohms = self._read_resistance(voltage_v)
-        return (1/298.15 + 1/self.b * log(r1_ohms/self.thermistor_ohms))**(-1)
+        return self._kelvin(self._vin_sample/self._sample())
+
+    def read_temperature_f(self):
+        """
+        returns the temperature in degrees Fahrenheit
+        Note: overrides base class read_temperature_f to convert in a single call
+        """
+        return (self._kelvin(self._vin_sample/self._sample()) - _ABS0_C) * _C_TO_F + 32.0
 
 
 class AnalogTemperatureSensor(TemperatureSensor):
@@ -95,13 +142,37 @@ class AnalogTemperatureSensor(TemperatureSensor):
         self.gain = (t1_c - t2_c)/(v1_v - v2_v)
         self.offset = self.gain * (0 - v1_v) + t1_c
         self.voltage_input = voltage_input_interface
+        self.rebind()
+
+    def rebind(self):
+        """
+        Refreshes the cached voltage read method and rebuilds the specialized read_temperature_*
+        methods. Call this after replacing voltage_input or changing gain or offset.
+        The cached read() follows the input's simulated mode on every call, so toggling
+        voltage_input.simulated needs no rebind.
+        """
+        self._sample = read = self.voltage_input.read
+        # Bake the line constants for each unit into closures so the hot path does no attribute
+        # lookups. Methods a subclass overrides (directly or via read_temperature_c) keep using
+        # the class implementations so the override is honored.
+        cls = type(self)
+        if cls.read_temperature_c is not AnalogTemperatureSensor.read_temperature_c:
+            return
+        gain_c, offset_c = self.gain, self.offset
+        self.read_temperature_c = lambda: gain_c * read() + offset_c
+        if cls.read_temperature_k is AnalogTemperatureSensor.read_temperature_k:
+            offset_k = offset_c + _ABS0_C
+            self.read_temperature_k = lambda: gain_c * read() + offset_k
+        if cls.read_temperature_f is TemperatureSensor.read_temperature_f:
+            gain_f, offset_f = gain_c * _C_TO_F, offset_c * _C_TO_F + 32.0
+            self.read_temperature_f = lambda: gain_f * read() + offset_f
 
     def read_temperature_c(self):
         """
         returns the temperature in Celsius.
         Note: overrides base class read_temperature_c
         """
-        voltage_v = self.voltage_input.read()
+        voltage_v = self._sample()
         return self.gain * voltage_v + self.offset
 
     def read_temperature_k(self):
@@ -109,7 +180,7 @@ class AnalogTemperatureSensor(TemperatureSensor):
         returns the temperature in Kelvin
         Note: implements abstract base class read_temperature_k
         """
-        return self.read_temperature_c() + TemperatureSensor.ABSOLUTE_ZERO_OFFSET_C
+        return self.read_temperature_c() + _ABS0_C
 
 
 class AD8495TCAmplifier(AnalogTemperatureSensor):
@@ -117,3 +188,40 @@ class AD8495TCAmplifier(AnalogTemperatureSensor):
     def __init__(self, voltage_input_interface, v1_v=1.25, t1_c=0.0, v2_v=1.5, t2_c=50):
         super().__init__(voltage_input_interface, v1_v, t1_c, v2_v, t2_c)
 
+
+def read_batch(thermistors):
+    """
+    returns a list of temperatures in degrees Celsius, one per Thermistor.
+    Voltage inputs of the same type are read together via read_many, and the Steinhart–Hart
+    equation is evaluated over all thermistors at once with NumPy when it is available
+    (JIT-compiled with Numba if that is installed too).
+    Raises ValueError if any divider voltage is outside (0, vin_v), e.g. from an open or floating
+    channel, before any temperature is computed.
+    """
+    voltages = [None] * len(thermistors)
+    indices_by_type = {}
+    for index, thermistor in enumerate(thermistors):
+        indices_by_type.setdefault(type(thermistor.voltage_input), []).append(index)
+    for input_type, indices in indices_by_type.items():
+        readings = input_type.read_many([thermistors[i].voltage_input for i in indices])
+        for index, voltage_v in zip(indices, readings):
+            voltages[index] = voltage_v
+    # Validate up front so every conversion path below fails the same way on a bad sample.
+    for index, (thermistor, voltage_v) in enumerate(zip(thermistors, voltages)):
+        if not 0 < voltage_v < thermistor.vin_v:
+            raise ValueError('Thermistor {} read {} V, outside the divider range (0, {}) V.'
+                             .format(index, voltage_v, thermistor.vin_v))
+    # numpy is optional, so fall back to evaluating each thermistor in turn without it.
+    try:
+        import numpy as np
+        from object_oriented_hardware.temperature_sensors_numba import steinhart_k
+    except ImportError:
+        return [t.convert_temperature_c(v) for t, v in zip(thermistors, voltages)]
+    voltage_v = np.asarray(voltages, dtype=float)
+    vin_v = np.asarray([t.vin_v for t in thermistors], dtype=float)
+    temperature_k = steinhart_k(vin_v/voltage_v,
+                                np.asarray([t.r2_ohms for t in thermistors], dtype=float),
+                                np.asarray([t._inv_t0 for t in thermistors], dtype=float),
+                                np.asarray([t._inv_b for t in thermistors], dtype=float),
+                                np.asarray([t._inv_r0 for t in thermistors], dtype=float))
+    return (temperature_k - _ABS0_C).tolist()
@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+Batch thermistor conversion kernel for temperature_sensors.read_batch.
+Requires numpy. The kernel is JIT-compiled with numba when it is installed, otherwise it runs as
+plain vectorized numpy.
+"""
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+def steinhart_k(ratio, r2_ohms, inv_t0, inv_b, inv_r0):
+    """
+    returns an array of thermistor temperatures in Kelvin, one per divider ratio vin/v.
+    Array counterpart of Thermistor._kelvin; inputs are expected to be validated by the caller.
+    """
+    r1_ohms = r2_ohms * (ratio - 1.0)
+    return 1.0/(inv_t0 + inv_b * np.log(r1_ohms * inv_r0))
+
+
+if numba is not None:
+    steinhart_k = numba.njit(cache=True)(steinhart_k)
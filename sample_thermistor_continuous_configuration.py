@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""
+Sample configuration for reading a thermistor as each ADC conversion completes, over the following interface:
+    Thermistor --> ADS1x15VoltageInputInterface --> ADS1015 --> bbi2c_bus(2)
+with the ADS1015 ALERT/RDY pin wired to a Beaglebone GPIO.
+"""
+
+import signal
+from object_oriented_hardware.ads1x15 import ADS1015
+from object_oriented_hardware.ads1x15 import ADS1015VoltageInputInterface
+from object_oriented_hardware.temperature_sensors import Thermistor
+from object_oriented_hardware.beaglebone_i2c import bbi2c_bus
+
+ALERT_RDY_GPIO = 60 # P9_12
+
+i2c_bus_2 = bbi2c_bus(2)
+
+adc_bank = ADS1015(i2c_bus_2)
+voltage_input = ADS1015VoltageInputInterface(adc_bank, channel_index=0)
+thermistor = Thermistor(voltage_input)
+
+voltage_input.start_continuous(lambda voltage_v: print(thermistor.convert_temperature_c(voltage_v)),
+                               ALERT_RDY_GPIO, data_rate=128)
+signal.pause()